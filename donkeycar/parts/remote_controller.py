@@ -3,16 +3,90 @@ Remote Controller Part for Donkeycar
 
 Receives steering/throttle commands from a remote Python client via socket.
 Save as: donkeycar/parts/remote_controller.py
+
+Wire format: each command is a fixed 8-byte little-endian payload of two
+floats, (steering, throttle). Clients should send ``_CMD.pack(steering,
+throttle)``; this avoids per-packet UTF-8 decode and JSON parsing in the
+receive loop.
+
+If msgpack is installed, clients may instead send a msgpack-encoded dict
+(e.g. ``msgpack.packb({'steering': s, 'throttle': t})``). Any payload
+that is not exactly 8 bytes is decoded this way, which leaves room for
+extra fields such as ``brake`` or ``mode`` without changing the fast
+path.
 """
+import os
+import selectors
 import socket
 import struct
-import json
 import time
 import threading
 import logging
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
+# command payload: two little-endian floats (steering, throttle)
+_CMD = struct.Struct('<ff')
+
+# monotonic clock for command staleness - immune to wall-clock jumps and
+# cheaper than time.time(); pre-bound since it runs at DRIVE_LOOP_HZ
+_now = time.monotonic
+
+# returned on safety timeout; shared so run_threaded allocates nothing
+_STOPPED = (0.0, 0.0)
+
+
+def _decode_command(data):
+    """
+    Decode a command payload into a (steering, throttle) tuple.
+
+    Fixed 8-byte struct packets take the fast path; anything else is
+    treated as a msgpack dict when msgpack is available.
+    """
+    if len(data) == _CMD.size:
+        return _CMD.unpack_from(data)
+    if msgpack is not None:
+        cmd = msgpack.unpackb(data, raw=False)
+        return float(cmd.get('steering', 0.0)), float(cmd.get('throttle', 0.0))
+    raise struct.error(f"expected {_CMD.size} byte packet, got {len(data)}")
+
+
+# every way a malformed payload can fail to decode: struct.error for
+# short packets, ValueError for msgpack framing errors (ExtraData
+# subclasses ValueError, not UnpackException), TypeError for unhashable
+# input and AttributeError when the payload decodes to a non-dict.
+# Network input must be logged and dropped, never kill the thread.
+_DECODE_ERRORS = (struct.error, ValueError, TypeError, AttributeError)
+if msgpack is not None:
+    _DECODE_ERRORS += (msgpack.exceptions.UnpackException,)
+
+
+def _boost_receive_thread():
+    """
+    Best-effort scheduling tweaks for the calling receive thread: pin it
+    to the highest-numbered available core (away from core 0, where IRQs
+    typically land) and request SCHED_FIFO so JPEG encoding or web
+    serving cannot preempt command reception. Requires Linux and, for
+    SCHED_FIFO, root; failures are logged at debug level and ignored.
+    """
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            cpus = os.sched_getaffinity(0)
+            if len(cpus) > 1:
+                os.sched_setaffinity(0, {max(cpus)})
+    except OSError as e:
+        logger.debug(f"Could not set receive thread affinity: {e}")
+    try:
+        if hasattr(os, 'sched_setscheduler'):
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(20))
+    except (OSError, PermissionError) as e:
+        logger.debug(f"Could not set SCHED_FIFO (needs root): {e}")
+
 
 class RemoteController:
     """
@@ -33,71 +107,111 @@ class RemoteController:
         self.throttle = 0.0
         
         # Timeout - if no command received, stop the car
-        self.last_command_time = time.time()
+        self.last_command_time = _now()
         self.timeout = 0.5  # seconds
         
         # Setup server socket
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.server_socket.setsockopt(
+                socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         self.server_socket.bind((host, port))
         self.server_socket.listen(1)
-        self.server_socket.settimeout(1.0)
-        
+        self.server_socket.setblocking(False)
+
         self.client_socket = None
-        
+
+        # preallocated receive buffer - the hot loop never allocates
+        self._buf = bytearray(1024)
+        self._mv = memoryview(self._buf)
+
         logger.info(f"RemoteController listening on {host}:{port}")
     
     def update(self):
-        """Threaded loop - accept connections and receive commands."""
-        while self.running:
-            # Accept new connection if needed
-            if self.client_socket is None:
+        """Threaded loop - accept connections and receive commands.
+
+        Both the listening socket and the accepted client socket are
+        multiplexed through one epoll-backed selector, so a new
+        connection or a new command wakes the thread immediately.
+        """
+        _boost_receive_thread()
+        sel = selectors.DefaultSelector()
+        sel.register(self.server_socket, selectors.EVENT_READ)
+        try:
+            while self.running:
                 try:
-                    self.client_socket, addr = self.server_socket.accept()
-                    self.client_socket.settimeout(0.1)
-                    logger.info(f"Client connected: {addr}")
-                except socket.timeout:
-                    continue
+                    for key, _ in sel.select(timeout=0.05):
+                        if key.fileobj is self.server_socket:
+                            self._accept(sel)
+                        else:
+                            self._receive(sel, key.fileobj)
+                except OSError as e:
+                    if not self.running:
+                        # socket closed by shutdown()
+                        break
+                    logger.error(f"Receive error: {e}")
                 except Exception as e:
-                    logger.error(f"Accept error: {e}")
-                    continue
-            
-            # Receive commands
-            try:
-                data = self.client_socket.recv(1024)
-                if not data:
-                    logger.info("Client disconnected")
-                    self.client_socket.close()
-                    self.client_socket = None
-                    self.steering = 0.0
-                    self.throttle = 0.0
-                    continue
-                
-                # Parse command (JSON format)
-                cmd = json.loads(data.decode('utf-8'))
-                self.steering = float(cmd.get('steering', 0.0))
-                self.throttle = float(cmd.get('throttle', 0.0))
-                self.last_command_time = time.time()
-                
-            except socket.timeout:
-                pass
-            except json.JSONDecodeError as e:
-                logger.warning(f"Invalid JSON: {e}")
-            except (ConnectionResetError, BrokenPipeError):
-                logger.info("Client disconnected")
-                self.client_socket.close()
-                self.client_socket = None
-                self.steering = 0.0
-                self.throttle = 0.0
-            except Exception as e:
-                logger.error(f"Receive error: {e}")
+                    logger.error(f"Receive error: {e}")
+        finally:
+            sel.close()
+
+    def _accept(self, sel):
+        """Accept a connection, replacing any existing client."""
+        try:
+            client, addr = self.server_socket.accept()
+        except BlockingIOError:
+            return
+        if self.client_socket is not None:
+            self._drop_client(sel, self.client_socket)
+        client.setblocking(False)
+        # disable Nagle - each tiny command packet should go out at once
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sel.register(client, selectors.EVENT_READ)
+        self.client_socket = client
+        logger.info(f"Client connected: {addr}")
+
+    def _receive(self, sel, sock):
+        """Read and apply commands from a ready client socket."""
+        try:
+            n = sock.recv_into(self._buf)
+        except BlockingIOError:
+            return
+        except (ConnectionResetError, BrokenPipeError):
+            n = 0
+        if not n:
+            logger.info("Client disconnected")
+            self._drop_client(sel, sock)
+            return
+        try:
+            if n >= _CMD.size and n % _CMD.size == 0:
+                # TCP has no message boundaries: back-to-back 8-byte
+                # commands from a fast sender coalesce into one recv.
+                # Apply the newest complete command in the buffer.
+                self.steering, self.throttle = _CMD.unpack_from(
+                    self._mv, (n // _CMD.size - 1) * _CMD.size)
+            else:
+                # Parse command (msgpack fallback)
+                self.steering, self.throttle = _decode_command(self._mv[:n])
+            self.last_command_time = _now()
+        except _DECODE_ERRORS as e:
+            logger.warning(f"Invalid command packet: {e}")
+
+    def _drop_client(self, sel, sock):
+        """Unregister and close a client socket; zero the commands."""
+        sel.unregister(sock)
+        sock.close()
+        if sock is self.client_socket:
+            self.client_socket = None
+        self.steering = 0.0
+        self.throttle = 0.0
     
     def run_threaded(self):
         """Return current steering and throttle."""
         # Safety timeout - stop if no recent commands
-        if time.time() - self.last_command_time > self.timeout:
-            return 0.0, 0.0
-        
+        if _now() - self.last_command_time > self.timeout:
+            return _STOPPED
+
         return self.steering, self.throttle
     
     def run(self):
@@ -127,36 +241,70 @@ class RemoteControllerUDP:
         
         self.steering = 0.0
         self.throttle = 0.0
-        self.last_command_time = time.time()
+        self.last_command_time = _now()
         self.timeout = 0.5
         
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # small receive buffer: the kernel holds at most a handful of
+        # commands, so a stalled reader can never build a stale backlog
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
         self.socket.bind((host, port))
-        self.socket.settimeout(0.1)
-        
+        self.socket.setblocking(False)
+
+        # preallocated receive buffer - the hot loop never allocates
+        self._buf = bytearray(1024)
+        self._mv = memoryview(self._buf)
+
         logger.info(f"RemoteControllerUDP listening on {host}:{port}")
-    
+
     def update(self):
-        """Threaded loop - receive UDP commands."""
-        while self.running:
-            try:
-                data, addr = self.socket.recvfrom(1024)
-                cmd = json.loads(data.decode('utf-8'))
-                self.steering = float(cmd.get('steering', 0.0))
-                self.throttle = float(cmd.get('throttle', 0.0))
-                self.last_command_time = time.time()
-                
-            except socket.timeout:
-                pass
-            except json.JSONDecodeError as e:
-                logger.warning(f"Invalid JSON: {e}")
-            except Exception as e:
-                logger.error(f"UDP receive error: {e}")
+        """Threaded loop - receive UDP commands (epoll-backed selector)."""
+        _boost_receive_thread()
+        sel = selectors.DefaultSelector()
+        sel.register(self.socket, selectors.EVENT_READ)
+        # hoist attribute lookups out of the hot loop - per iteration it
+        # then runs only C-level calls (select, recvfrom_into, unpack),
+        # which release the GIL while blocked in the kernel
+        select = sel.select
+        recvfrom_into = self.socket.recvfrom_into
+        buf = self._buf
+        mv = self._mv
+        try:
+            while self.running:
+                try:
+                    # wakes as soon as a datagram arrives; the short
+                    # timeout only bounds how long shutdown can take
+                    if not select(timeout=0.05):
+                        continue
+                    # drain every queued datagram; each recv overwrites
+                    # the buffer, so only the newest command is decoded
+                    n = 0
+                    while True:
+                        try:
+                            n, addr = recvfrom_into(buf)
+                        except BlockingIOError:
+                            break
+                    if n:
+                        try:
+                            self.steering, self.throttle = \
+                                _decode_command(mv[:n])
+                            self.last_command_time = _now()
+                        except _DECODE_ERRORS as e:
+                            logger.warning(f"Invalid command packet: {e}")
+                except OSError as e:
+                    if not self.running:
+                        # socket closed by shutdown()
+                        break
+                    logger.error(f"UDP receive error: {e}")
+                except Exception as e:
+                    logger.error(f"UDP receive error: {e}")
+        finally:
+            sel.close()
     
     def run_threaded(self):
         """Return current steering and throttle."""
-        if time.time() - self.last_command_time > self.timeout:
-            return 0.0, 0.0
+        if _now() - self.last_command_time > self.timeout:
+            return _STOPPED
         return self.steering, self.throttle
     
     def run(self):
@@ -167,4 +315,47 @@ class RemoteControllerUDP:
         self.steering = 0.0
         self.throttle = 0.0
         self.socket.close()
-        logger.info("RemoteControllerUDP shutdown")
\ No newline at end of file
+        logger.info("RemoteControllerUDP shutdown")
+
+
+class RemoteControllerUnix(RemoteControllerUDP):
+    """
+    Unix-domain datagram version - same semantics as RemoteControllerUDP
+    but bypasses the IP stack entirely. Use when the sender (e.g. a ROS
+    node or gamepad daemon) runs on the same machine as the drive loop.
+    """
+    def __init__(self, path='/tmp/donkey.sock'):
+        self.path = path
+        self.running = True
+
+        self.steering = 0.0
+        self.throttle = 0.0
+        self.last_command_time = _now()
+        self.timeout = 0.5
+
+        # remove a stale socket file from a previous run
+        if os.path.exists(path):
+            os.unlink(path)
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        # small receive buffer: the kernel holds at most a handful of
+        # commands, so a stalled reader can never build a stale backlog
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        self.socket.bind(path)
+        self.socket.setblocking(False)
+
+        # preallocated receive buffer - the hot loop never allocates
+        self._buf = bytearray(1024)
+        self._mv = memoryview(self._buf)
+
+        logger.info(f"RemoteControllerUnix listening on {path}")
+
+    def shutdown(self):
+        self.running = False
+        self.steering = 0.0
+        self.throttle = 0.0
+        self.socket.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        logger.info("RemoteControllerUnix shutdown")
\ No newline at end of file
@@ -16,6 +16,8 @@ DONKEY_GYM = False
 # Image Socket Streamer Configuration
 STREAM_PORT = 5555
 JPEG_QUALITY = 80
+STREAM_FPS = 10         # maximum web stream frame rate; frames above this are dropped before encoding
+STREAM_INPUT_IS_BGR = False  # true if the camera already outputs BGR; skips the RGB->BGR pass before JPEG encoding
 
 # CAMERA configuration
 #
@@ -54,6 +56,7 @@ CONSTANT_THROTTLE = 0.7
 
 USE_REMOTE_UDP_CONTROLLER = True
 REMOTE_CONTROL_PORT = 5001
+REMOTE_CONTROL_UNIX_PATH = None  # e.g. '/tmp/donkey.sock' to receive commands over a Unix-domain socket when the sender runs on the same machine
 
 # DRIVE TRAIN TYPE
 DRIVE_TRAIN_TYPE = "PWM_STEERING_THROTTLE"
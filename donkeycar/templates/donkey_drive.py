@@ -10,9 +10,9 @@ Options:
     --log=<level>      Log level [default: INFO].
 """
 
+import asyncio
 import os
 import logging
-import threading
 import time
 
 logger = logging.getLogger(__name__)
@@ -24,58 +24,117 @@ try:
 except:
     pass
 
-from flask import Flask, Response, render_template_string
+import tornado.web
+import tornado.iostream
+from tornado.ioloop import IOLoop
 from docopt import docopt
 
 import donkeycar as dk
 from donkeycar.templates.complete import add_camera
 from donkeycar.parts.lidar import RPLidar2, ScanFilter
-from donkeycar.parts.remote_controller import RemoteControllerUDP
+from donkeycar.parts.remote_controller import RemoteControllerUDP, \
+    RemoteControllerUnix
 from donkeycar.templates.complete import add_drivetrain
 
 HOST_PC_IP = "10.232.53.79"
 UDP_PORT = 7000
 
-app = Flask(__name__)
+class ImageWebStreamer(tornado.web.Application):
+    """
+    Publishes camera frames as an MJPEG web stream.
+
+    Accepts either numpy image arrays (encoded to JPEG on the CPU) or
+    ready-made JPEG bytes from a camera pipeline with a hardware MJPEG
+    encoder (e.g. a GStreamer v4l2/jpegenc source), which are forwarded
+    without re-encoding.
 
-class ImageWebStreamer:
+    Served by a tornado event loop in a single background thread, so N
+    viewers cost N registered sockets rather than N OS threads.
+    """
     def __init__(self, cfg):
         self.port = cfg.STREAM_PORT
         self.jpeg_quality = cfg.JPEG_QUALITY
-        self.image = None
+        self.input_is_bgr = getattr(cfg, 'STREAM_INPUT_IS_BGR', False)
+        # built once - run_threaded should not allocate a params list
+        # per frame
+        self._encode_params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        # a monitoring stream rarely needs the full drive-loop rate;
+        # frames above STREAM_FPS are dropped before the encode
+        self._min_interval = 1.0 / getattr(cfg, 'STREAM_FPS', 10)
+        self._last_publish = 0.0
         self.running = True
-        self.lock = threading.Lock()
+        # no lock: run_threaded is the only writer and publishes each
+        # frame as an immutable bytes object with a single reference
+        # store, which is atomic under the GIL; viewers read a snapshot
+        self._jpeg_bytes = None
+        # created on the server loop in update(); set from the vehicle
+        # loop via add_callback to wake every waiting viewer
+        self._frame_ready = None
+        self.loop = None
+
+        handlers = [
+            (r"/", IndexHandler),
+            (r"/video_feed", VideoFeedHandler),
+        ]
+        super().__init__(handlers)
 
     def get_frame(self):
-        with self.lock:
-            if self.image is not None:
-                # Convert RGB to BGR for cv2
-                img_bgr = cv2.cvtColor(self.image, cv2.COLOR_RGB2BGR)
-                _, encoded = cv2.imencode(
-                    '.jpg', img_bgr, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
-                )
-                return encoded.tobytes()
-        return None
+        # encoded once per vehicle tick in run_threaded; reading the
+        # reference is atomic, so every viewer shares the same bytes
+        return self._jpeg_bytes
 
     def update(self):
-        """Background thread - runs Flask server"""
+        """Background thread - runs the tornado event loop."""
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        self._frame_ready = asyncio.Event()
+        self.listen(self.port)
+        self.loop = IOLoop.current()
         logger.info(f"Web stream available at http://0.0.0.0:{self.port}")
-        app.run(host='0.0.0.0', port=self.port, threaded=True, use_reloader=False)
+        self.loop.start()
+
+    def _publish(self):
+        """Runs on the server loop - wake all viewers for a new frame."""
+        self._frame_ready.set()
+        self._frame_ready.clear()
 
     def run_threaded(self, image):
-        """Called by vehicle loop - updates the image"""
-        with self.lock:
-            self.image = image
+        """Called by vehicle loop - encodes and publishes the frame"""
+        if image is None:
+            return
+        now = time.monotonic()
+        if now - self._last_publish < self._min_interval:
+            return
+        self._last_publish = now
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            # already JPEG-encoded (hardware MJPEG pipeline) - forward as-is
+            self._jpeg_bytes = bytes(image)
+            self._notify()
+            return
+        if self.input_is_bgr:
+            # camera already delivers BGR - skip the conversion pass
+            img_bgr = image
+        else:
+            # RGB to BGR is just a channel reversal; a negative-stride
+            # view costs nothing, unlike the cvtColor copy, and
+            # imencode accepts non-contiguous input
+            img_bgr = image[..., ::-1]
+        _, encoded = cv2.imencode('.jpg', img_bgr, self._encode_params)
+        # single copy per frame: imencode manages its own output array,
+        # so tobytes() is the only allocation we control here
+        self._jpeg_bytes = encoded.tobytes()
+        self._notify()
+
+    def _notify(self):
+        if self.loop is not None:
+            self.loop.add_callback(self._publish)
 
     def shutdown(self):
         self.running = False
+        if self.loop is not None:
+            self.loop.add_callback(self.loop.stop)
         logger.info("ImageWebStreamer shutdown")
 
 
-# Global streamer reference for Flask routes
-streamer = None
-
-
 HTML_PAGE = """
 <!DOCTYPE html>
 <html>
@@ -108,30 +167,49 @@ HTML_PAGE = """
 """
 
 
-@app.route('/')
-def index():
-    return render_template_string(HTML_PAGE)
+class IndexHandler(tornado.web.RequestHandler):
+    def get(self):
+        # HTML_PAGE is a constant - served without any templating
+        self.set_header('Content-Type', 'text/html')
+        self.write(HTML_PAGE)
 
 
-@app.route('/video_feed')
-def video_feed():
-    def generate():
-        while True:
+# constant multipart framing chunks - built once, never copied per frame
+_FRAME_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+_FRAME_TAIL = b'\r\n'
+
+
+class VideoFeedHandler(tornado.web.RequestHandler):
+    """
+    Serves the MJPEG stream. Each viewer awaits the shared frame event,
+    so idle viewers cost nothing and every published JPEG is written to
+    all connected sockets from the single event-loop thread.
+    """
+
+    async def get(self):
+        self.set_header('Content-Type',
+                        'multipart/x-mixed-replace; boundary=frame')
+        streamer = self.application
+        while streamer.running:
+            await streamer._frame_ready.wait()
             frame = streamer.get_frame()
-            if frame is not None:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-            time.sleep(0.01)
-    
-    return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
+            if frame is None:
+                continue
+            # framing and payload written separately so the shared
+            # JPEG bytes go to the socket without concatenation
+            self.write(_FRAME_HEADER)
+            self.write(frame)
+            self.write(_FRAME_TAIL)
+            try:
+                await self.flush()
+            except tornado.iostream.StreamClosedError:
+                return
 
 
 def drive(cfg):
     """
     Construct a vehicle to stream camera images over web.
     """
-    global streamer
-
     V = dk.vehicle.Vehicle()
 
     # Initialize logging
@@ -146,7 +224,11 @@ def drive(cfg):
         # steering = getattr(cfg, 'CONSTANT_STEERING', 0.0)
         # throttle = getattr(cfg, 'CONSTANT_THROTTLE', 0.3)
 
-        controller = RemoteControllerUDP(host='0.0.0.0', port=cfg.REMOTE_CONTROL_PORT)    
+        unix_path = getattr(cfg, 'REMOTE_CONTROL_UNIX_PATH', None)
+        if unix_path:
+            controller = RemoteControllerUnix(path=unix_path)
+        else:
+            controller = RemoteControllerUDP(host='0.0.0.0', port=cfg.REMOTE_CONTROL_PORT)
         V.add(controller, outputs=['steering', 'throttle'], threaded=True)
         add_drivetrain(V, cfg)  
 
@@ -0,0 +1,101 @@
+import struct
+import unittest
+import pytest
+
+from donkeycar.parts import remote_controller
+from donkeycar.parts.remote_controller import \
+    _CMD, _DECODE_ERRORS, _decode_command, RemoteControllerUDP
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class TestDecodeCommand(unittest.TestCase):
+
+    def test_struct_fast_path(self):
+        steering, throttle = _decode_command(_CMD.pack(0.25, -0.5))
+        self.assertAlmostEqual(0.25, steering, places=6)
+        self.assertAlmostEqual(-0.5, throttle, places=6)
+
+    def test_struct_fast_path_memoryview(self):
+        # the receive loops hand _decode_command a memoryview slice of
+        # the preallocated buffer
+        buf = bytearray(1024)
+        _CMD.pack_into(buf, 0, 0.1, 0.2)
+        steering, throttle = _decode_command(memoryview(buf)[:_CMD.size])
+        self.assertAlmostEqual(0.1, steering, places=6)
+        self.assertAlmostEqual(0.2, throttle, places=6)
+
+    def test_short_packet_is_decode_error(self):
+        with self.assertRaises(_DECODE_ERRORS):
+            _decode_command(b'\x00\x01\x02')
+
+    def test_short_packet_without_msgpack(self):
+        # without msgpack only exact 8-byte packets are accepted
+        saved = remote_controller.msgpack
+        remote_controller.msgpack = None
+        try:
+            with self.assertRaises(struct.error):
+                _decode_command(b'\x00' * 16)
+        finally:
+            remote_controller.msgpack = saved
+
+    @pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+    def test_msgpack_dict(self):
+        data = msgpack.packb({'steering': 0.5, 'throttle': -0.25})
+        steering, throttle = _decode_command(data)
+        self.assertAlmostEqual(0.5, steering, places=6)
+        self.assertAlmostEqual(-0.25, throttle, places=6)
+
+    @pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+    def test_msgpack_missing_fields_default_to_zero(self):
+        self.assertEqual((0.0, 0.0), _decode_command(msgpack.packb({})))
+
+    @pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+    def test_msgpack_non_dict_is_decode_error(self):
+        # a payload that decodes but is not a mapping must raise within
+        # _DECODE_ERRORS so the receive loop drops it and stays alive
+        with self.assertRaises(_DECODE_ERRORS):
+            _decode_command(msgpack.packb([1, 2, 3]))
+
+    @pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+    def test_garbage_is_decode_error(self):
+        with self.assertRaises(_DECODE_ERRORS):
+            _decode_command(b'not-a-real-packet')
+
+    @pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+    def test_oversized_struct_is_decode_error(self):
+        # 16 bytes looks like two struct commands; on the datagram path
+        # that is malformed and must be dropped, not kill the thread
+        with self.assertRaises(_DECODE_ERRORS):
+            _decode_command(b'\x00' * (2 * _CMD.size))
+
+
+class TestSafetyTimeout(unittest.TestCase):
+
+    def test_fresh_command_is_returned(self):
+        controller = RemoteControllerUDP(host='127.0.0.1', port=0)
+        try:
+            controller.steering = 0.5
+            controller.throttle = 0.25
+            controller.last_command_time = remote_controller._now()
+            self.assertEqual((0.5, 0.25), controller.run_threaded())
+        finally:
+            controller.shutdown()
+
+    def test_stale_command_stops_the_car(self):
+        controller = RemoteControllerUDP(host='127.0.0.1', port=0)
+        try:
+            controller.steering = 0.5
+            controller.throttle = 0.25
+            controller.last_command_time = \
+                remote_controller._now() - (controller.timeout + 0.1)
+            self.assertEqual((0.0, 0.0), controller.run_threaded())
+        finally:
+            controller.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()